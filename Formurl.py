@@ -2,9 +2,27 @@ import requests
 import re
 import json
 import os
-from urllib.parse import urlparse, urlencode
+import functools
+import hashlib
+import shelve
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote_plus
 import google.generativeai as genai
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+logger = logging.getLogger(__name__)
 
 #https://docs.google.com/forms/d/e/1FAIpQLSdVh3dJt_0ZfEHGlo--uQl9ewe3kajePbw8K6Dlq785dBDbew/viewform
 
@@ -13,37 +31,131 @@ GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 if GOOGLE_API_KEY:
     genai.configure(api_key=GOOGLE_API_KEY)
 
+# Precompiled patterns shared across the handler
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+FORM_ID_RE = re.compile(r'/forms/(?:u/\d+/)?d/e/([^/?#]+)')
+OPTIMIST_RE = re.compile(r'optimist\s*:\s*true', re.IGNORECASE)
+EMAIL_CONFIRM_KEYWORDS = ("use", "confirm", "record", "include", "verify", "yes, this is", "select this email")
+EMAIL_CONFIRM_RE = re.compile('|'.join(map(re.escape, EMAIL_CONFIRM_KEYWORDS)))
+
+_CHOICE_TYPES = frozenset({2, 3, 4}) # 2:MC, 3:Dropdown, 4:Checkboxes
+
+FB_DATA_ANCHOR = 'var FB_PUBLIC_LOAD_DATA_ = '
+
+PROMPT_TAIL = """
+
+Provide ONLY the exact answer that should be filled in the form field for this question. No explanations, no conversational text, just the answer itself. If the question asks for a choice from options, your answer MUST be one of the provided options.
+"""
+
+# On-disk cache of Gemini responses, keyed by a hash of the full prompt
+AI_CACHE_PATH = os.path.expanduser('~/.gform_ai_cache')
+
+# Concurrent Gemini requests in generate_answers
+AI_MAX_WORKERS = 8
+
+# A complete JSON string (respecting escapes), or a trailing comma before ] or }
+PAYLOAD_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|,(\s*[\]\}])', re.DOTALL)
+
+def _clean_payload_token(match: re.Match) -> str:
+    """Replacement callback for PAYLOAD_TOKEN_RE."""
+    closing = match.group(1)
+    if closing is not None:
+        return closing
+    token = match.group(0)
+    if '\n' in token or '\r' in token:
+        return token.replace('\n', '\\n').replace('\r', '\\r')
+    return token
+
+def _clean_fb_payload(data_str: str) -> str:
+    """Fix common JSON issues in FB_PUBLIC_LOAD_DATA_ in a single pass.
+
+    Raw newlines/carriage returns inside strings are escaped, and trailing
+    commas before ] or } outside strings are dropped. Text between tokens
+    is copied as-is.
+    """
+    return PAYLOAD_TOKEN_RE.sub(_clean_payload_token, data_str)
+
+def _is_choice_question(q_data: dict) -> bool:
+    return bool(q_data['type'] in _CHOICE_TYPES and q_data['options'])
+
+@functools.lru_cache(maxsize=4)
+def _load_userdata(file_path: str, mtime: float) -> str:
+    """Reads the user data file; cached per (path, mtime) so edits are picked up."""
+    with open(file_path, 'r') as f:
+        return f.read()
+
 class GoogleFormHandler:
     def __init__(self):
         if GOOGLE_API_KEY:
             try:
                 self.model = genai.GenerativeModel('models/gemini-2.0-flash')
             except Exception as e:
-                print(f"Error initializing Gemini model: {e}")
+                logger.error("Error initializing Gemini model: %s", e)
                 self.model = None
         else:
             self.model = None
-            print("Google API Key not found. AI features will be disabled.")
+            logger.warning("Google API Key not found. AI features will be disabled.")
+        self._user_profile = None
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount('https://', adapter)
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        if self.model:
+            try:
+                self._cache = shelve.open(AI_CACHE_PATH, flag='c')
+            except Exception as e:
+                logger.warning("Could not open AI response cache '%s': %s", AI_CACHE_PATH, e)
+
+    def close(self):
+        """Flushes and closes the AI response cache and the HTTP session."""
+        cache = getattr(self, '_cache', None)
+        self._cache = None
+        if cache is not None:
+            try:
+                cache.close()
+            except Exception as e:
+                logger.warning("Could not close AI response cache: %s", e)
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def get_user_data_content(self, file_path='userdata.txt') -> str:
         """Reads the raw content of the user data file."""
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return f.read()
-        print(f"Warning: User data file '{file_path}' not found or is empty.")
+        try:
+            return _load_userdata(file_path, os.stat(file_path).st_mtime)
+        except FileNotFoundError:
+            pass
+        logger.warning("User data file '%s' not found or is empty.", file_path)
         return "User data file not found or is empty."
 
+    def get_user_profile(self, file_path='userdata.txt') -> Tuple[str, Optional[str], bool]:
+        """Returns (content, primary email, optimist flag), recomputed only when the content changes."""
+        user_data_content = self.get_user_data_content(file_path)
+        if self._user_profile is None or self._user_profile[0] != user_data_content:
+            user_primary_email = self.extract_primary_email_from_userdata(user_data_content)
+            is_optimist = OPTIMIST_RE.search(user_data_content) is not None
+            self._user_profile = (user_data_content, user_primary_email, is_optimist)
+        return self._user_profile
+
     def extract_primary_email_from_userdata(self, user_data_content: str) -> Optional[str]:
         """Extracts the primary email address from userdata.txt content."""
-        email_regex = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
         lines = user_data_content.split('\n')
         for line in lines:
+            if "@" not in line:
+                continue
             line_lower = line.lower()
-            if line_lower.startswith("email -") or line_lower.startswith("email:") or "primary email" in line_lower:
-                match = re.search(email_regex, line)
+            if line_lower.startswith(("email -", "email:", "email =")) or "primary email" in line_lower:
+                match = EMAIL_RE.search(line)
                 if match:
                     return match.group(0).strip()
-        first_email_found = re.search(email_regex, user_data_content)
+        first_email_found = EMAIL_RE.search(user_data_content)
         if first_email_found:
             return first_email_found.group(0).strip()
         return None
@@ -51,11 +163,11 @@ class GoogleFormHandler:
     def get_form_source(self, url: str) -> Optional[str]:
         """Fetch the source code of a Google Form."""
         try:
-            response = requests.get(url)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
-            print(f"Error fetching form: {e}")
+            logger.error("Error fetching form: %s", e)
             return None
 
     def extract_form_data(self, source_code: str) -> Optional[list]:
@@ -63,272 +175,274 @@ class GoogleFormHandler:
         if not source_code:
             return None
         
-        match = re.search(r'var FB_PUBLIC_LOAD_DATA_ = (.*?);', source_code, re.DOTALL)
-        if not match:
-            print("Could not find FB_PUBLIC_LOAD_DATA_ in source code. Form structure might be different or page not fully loaded.")
+        start = source_code.find(FB_DATA_ANCHOR)
+        end = source_code.find(';', start + len(FB_DATA_ANCHOR)) if start != -1 else -1
+        if end == -1:
+            logger.error("Could not find FB_PUBLIC_LOAD_DATA_ in source code. Form structure might be different or page not fully loaded.")
             return None
         
-        data_str = match.group(1)
+        data_str = source_code[start + len(FB_DATA_ANCHOR):end]
         
         # Attempt to fix common JSON issues before parsing
-        # 1. Escape unescaped newlines within strings (common cause of "Unterminated string")
-        # This regex looks for a newline that is NOT preceded by a backslash (already escaped)
-        # and is within a string (by roughly checking for surrounding quotes, not perfectly robust but helps)
-        # A truly robust solution for arbitrary unescaped characters in JS pseudo-JSON is very complex.
-        data_str_cleaned = re.sub(r'(?<!\\)\n', r'\\n', data_str)
-        data_str_cleaned = re.sub(r'(?<!\\)\r', r'\\r', data_str_cleaned)
-        
-        # 2. Remove trailing commas before ] or }
-        data_str_cleaned = re.sub(r',(\s*[\]\}])', r'\1', data_str_cleaned)
+        # (unescaped newlines within strings, trailing commas before ] or })
+        data_str_cleaned = _clean_fb_payload(data_str)
         
         try:
-            form_data = json.loads(data_str_cleaned)
-            print("Successfully parsed FB_PUBLIC_LOAD_DATA_ after cleaning.")
+            form_data = _loads(data_str_cleaned)
+            logger.info("Successfully parsed FB_PUBLIC_LOAD_DATA_ after cleaning.")
             return form_data
         except json.JSONDecodeError as e:
-            print(f"Error parsing form data (FB_PUBLIC_LOAD_DATA_) even after cleaning: {e}.")
-            print(f"Cleaned data (first 500 chars): {data_str_cleaned[:500]}...")
-            # As a last resort, try parsing the original string if cleaning failed
-            if data_str_cleaned != data_str:
-                try:
-                    print("Attempting to parse original FB_PUBLIC_LOAD_DATA_ string...")
-                    form_data_original = json.loads(data_str)
-                    print("Successfully parsed original FB_PUBLIC_LOAD_DATA_.")
-                    return form_data_original
-                except json.JSONDecodeError as e2:
-                    print(f"Error parsing original form data string as well: {e2}.")
-                    print(f"Original data (first 500 chars): {data_str[:500]}...")
+            logger.error("Error parsing form data (FB_PUBLIC_LOAD_DATA_) even after cleaning: %s.", e)
+            logger.debug("Cleaned data (first 500 chars): %s...", data_str_cleaned[:500])
             return None
 
     def extract_questions(self, form_data: list) -> Dict[str, dict]:
         if not form_data or not isinstance(form_data, list) or len(form_data) < 2 or form_data[1] is None:
-            print("Form data structure is not as expected for question extraction (form_data[1] is None or too short).")
+            logger.error("Form data structure is not as expected for question extraction (form_data[1] is None or too short).")
             return {}
         
         questions = {}
         form_description_and_questions = form_data[1]
         if not isinstance(form_description_and_questions, list) or len(form_description_and_questions) < 2:
-            print("Form data structure is not as expected (form_description_and_questions issue).")
+            logger.error("Form data structure is not as expected (form_description_and_questions issue).")
             return {}
 
         form_questions_list = form_description_and_questions[1]
         if not form_questions_list: 
-            print("No questions found in the form structure (form_questions_list is empty/None).")
+            logger.warning("No questions found in the form structure (form_questions_list is empty/None).")
             return {}
         
         for question_data_list in form_questions_list:
-            if not isinstance(question_data_list, list) or len(question_data_list) < 2:
-                continue 
-
-            question_text = str(question_data_list[1]) if question_data_list[1] is not None else "No question text"
-            question_type_raw = question_data_list[3] 
-            
-            question_id = None
-            options = []
-            
-            if len(question_data_list) >= 5 and isinstance(question_data_list[4], list) and question_data_list[4]:
-                question_params_list = question_data_list[4]
-                if question_params_list and isinstance(question_params_list[0], list) and len(question_params_list[0]) > 0:
-                    question_id = question_params_list[0][0]
-                    
-                    if len(question_params_list[0]) >= 2 and isinstance(question_params_list[0][1], list):
-                        raw_options = question_params_list[0][1]
-                        for opt_list in raw_options:
-                            if isinstance(opt_list, list) and len(opt_list) > 0 and opt_list[0] is not None:
-                                options.append(str(opt_list[0])) 
+            try:
+                question_text = str(question_data_list[1]) if question_data_list[1] is not None else "No question text"
+                question_type_raw = question_data_list[3] 
+                question_params = question_data_list[4][0]
+                question_id = question_params[0]
+                raw_options = (question_params[1] or []) if len(question_params) >= 2 else []
+                options = [str(opt_list[0]) for opt_list in raw_options if opt_list and opt_list[0] is not None]
+            except (TypeError, IndexError, KeyError):
+                continue
             
             if question_id is not None:
-                questions[str(question_id)] = {
+                # Question IDs are normalized to str here; callers use them as-is
+                question_id = str(question_id)
+                options_by_lower = {}
+                for o in options:
+                    options_by_lower.setdefault(o.strip().lower(), o)
+                questions[question_id] = {
                     'text': question_text,
                     'type': question_type_raw, 
-                    'options': options
+                    'options': options,
+                    'options_lower': [o.lower() for o in options],
+                    'option_emails': [EMAIL_RE.search(o) for o in options],
+                    'options_by_lower': options_by_lower
                 }
         
         if not questions:
-            print("Warning: No questions were successfully extracted. The form structure might be different than expected or form has no input fields.")
+            logger.warning("No questions were successfully extracted. The form structure might be different than expected or form has no input fields.")
         return questions
 
+    def _build_preamble(self, user_data_content: str) -> str:
+        """Builds the prompt prefix shared by every question."""
+        return f"""You are a precise form-filling assistant. Your task is to provide a direct and concise answer for a single Google Form question.
+Based on the user's information provided below, answer the following question.
+
+USER INFORMATION (from userdata.txt):
+---
+{user_data_content}
+---
+
+QUESTION TO ANSWER:
+"""
+
+    def _build_context(self, q_data: dict, preamble: str) -> str:
+        """Builds the Gemini prompt for a single question."""
+        context = preamble + q_data['text'] + PROMPT_TAIL
+        if _is_choice_question(q_data):
+            context += f"Available options for this question: {_dumps(q_data['options'])}\n"
+        return context
+
+    def _generate_text(self, context: str) -> str:
+        """Returns Gemini's stripped response text for a prompt, reusing cached responses."""
+        # The prompt embeds the user data, question text and options, so it fully determines the answer
+        key = hashlib.sha256(context.encode()).hexdigest()
+        if self._cache is not None:
+            with self._cache_lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        text = self.model.generate_content(context).text.strip()
+        if self._cache is not None:
+            # Best-effort: a failed store must not discard a valid answer
+            try:
+                with self._cache_lock:
+                    self._cache[key] = text
+            except Exception as e:
+                logger.warning("Could not store AI response in cache: %s", e)
+        return text
+
+    def _ai_answer_one(self, q_id: str, q_data: dict, context: str) -> str:
+        """Asks Gemini for one answer and maps it onto the question's options."""
+        is_choice_question = _is_choice_question(q_data)
+        try:
+            ai_answer = self._generate_text(context)
+            ai_answer = ai_answer.split('\n')[0]
+            ai_answer = ai_answer.replace("Answer:", "").replace("\"", "").strip()
+
+            if is_choice_question:
+                options_by_lower = q_data['options_by_lower']
+                ans_key = ai_answer.strip().lower()
+                matched_option = options_by_lower.get(ans_key)
+                if matched_option is None:
+                    matched_option = next((orig for low, orig in options_by_lower.items() if low in ans_key), None)
+                answer = matched_option if matched_option else (q_data['options'][0] if q_data['options'] else "")
+            else: 
+                answer = ai_answer
+            
+            logger.info("AI (For '%s'): %s", q_data['text'], answer)
+            return answer
+
+        except Exception as e:
+            logger.error("Error generating AI answer for question '%s': %s", q_data['text'], e)
+            if is_choice_question and q_data['options']:
+                return q_data['options'][0] 
+            return "Error: No AI answer"
+
     def generate_answers(self, questions: Dict[str, dict]) -> Dict[str, str]:
         if not self.model:
-            print("Gemini model not initialized. AI features disabled.")
+            logger.warning("Gemini model not initialized. AI features disabled.")
             manual_answers = {}
             print("\nPlease manually enter answers for the questions:")
             for q_id, q_data in questions.items():
                 manual_answers[q_id] = input(f"{q_data['text']} (Options: {q_data.get('options', [])}): ")
             return manual_answers
 
-        user_data_content = self.get_user_data_content()
-        user_primary_email = self.extract_primary_email_from_userdata(user_data_content)
-        is_optimist = "optimist: true" in user_data_content.lower() 
+        user_data_content, user_primary_email, is_optimist = self.get_user_profile()
         
+        preamble = self._build_preamble(user_data_content)
         answers = {}
-        print("\nGenerating answers using AI...")
-        email_regex = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        email_confirm_keywords = ["use", "confirm", "record", "include", "verify", "yes, this is", "select this email"]
+        pending = []
+        logger.info("Generating answers using AI...")
 
         for q_id, q_data in questions.items():
             question_text_for_prompt = q_data['text']
-            is_choice_question = q_data['type'] in [2, 3, 4] and q_data['options'] # 2:MC, 3:Dropdown, 4:Checkboxes
+            is_choice_question = _is_choice_question(q_data)
 
             if is_choice_question and user_primary_email:
-                for option_text in q_data['options']:
-                    option_lower = option_text.lower()
-                    contains_keyword = any(keyword in option_lower for keyword in email_confirm_keywords)
+                for option_text, option_lower, match in zip(q_data['options'], q_data['options_lower'], q_data['option_emails']):
+                    contains_keyword = EMAIL_CONFIRM_RE.search(option_lower) is not None
                     if "email" in option_lower and contains_keyword:
-                        match = re.search(email_regex, option_text)
                         if match:
                             email_in_option = match.group(0).strip()
                             if email_in_option.lower() == user_primary_email.lower():
                                 answers[q_id] = option_text 
-                                print(f"AI (Auto-selected email '{email_in_option}' for '{q_data['text']}'): {option_text}")
+                                logger.info("AI (Auto-selected email '%s' for '%s'): %s", email_in_option, q_data['text'], option_text)
                                 break 
                 if q_id in answers: 
                     continue
 
             if is_choice_question and 'rating' in question_text_for_prompt.lower() and is_optimist and q_data['options']:
                 answers[q_id] = q_data['options'][-1]
-                print(f"AI (Optimist Override for '{q_data['text']}'): {answers[q_id]}")
+                logger.info("AI (Optimist Override for '%s'): %s", q_data['text'], answers[q_id])
                 continue
             
-            context = f"""You are a precise form-filling assistant. Your task is to provide a direct and concise answer for a single Google Form question.
-Based on the user's information provided below, answer the following question.
+            pending.append((q_id, q_data, self._build_context(q_data, preamble)))
 
-USER INFORMATION (from userdata.txt):
----
-{user_data_content}
----
-
-QUESTION TO ANSWER:
-{question_text_for_prompt}
+        # The remaining questions need a Gemini round trip each; overlap them
+        if pending:
+            with ThreadPoolExecutor(max_workers=AI_MAX_WORKERS) as executor:
+                futures = {executor.submit(self._ai_answer_one, *item): item[0] for item in pending}
+                for future in as_completed(futures):
+                    answers[futures[future]] = future.result()
 
-Provide ONLY the exact answer that should be filled in the form field for this question. No explanations, no conversational text, just the answer itself. If the question asks for a choice from options, your answer MUST be one of the provided options.
-"""
-            if is_choice_question:
-                context += f"Available options for this question: {json.dumps(q_data['options'])}\n"
-            
-            try:
-                response = self.model.generate_content(context)
-                ai_answer = response.text.strip()
-                ai_answer = ai_answer.split('\n')[0]
-                ai_answer = ai_answer.replace("Answer:", "").replace("\"", "").strip()
-
-                if is_choice_question:
-                    matched_option = None
-                    for option in q_data['options']:
-                        if option.strip().lower() == ai_answer.strip().lower():
-                            matched_option = option
-                            break
-                    if not matched_option:
-                         for option in q_data['options']:
-                            if option.strip().lower() in ai_answer.strip().lower(): 
-                                matched_option = option
-                                break
-                    answers[q_id] = matched_option if matched_option else (q_data['options'][0] if q_data['options'] else "")
-                else: 
-                    answers[q_id] = ai_answer
-                
-                print(f"AI (For '{q_data['text']}'): {answers[q_id]}")
-
-            except Exception as e:
-                print(f"Error generating AI answer for question '{q_data['text']}': {e}")
-                if is_choice_question and q_data['options']:
-                    answers[q_id] = q_data['options'][0] 
-                else:
-                    answers[q_id] = "Error: No AI answer"
-        return answers
+        # Keep the form's question order for review and URL building
+        return {q_id: answers[q_id] for q_id in questions if q_id in answers}
 
     def generate_prefilled_url(self, base_url: str, answers: Dict[str, str]) -> Optional[str]:
-        parsed_url = urlparse(base_url)
-        form_id_match = re.search(r'/forms/d/e/([^/]+)/viewform', base_url)
+        form_id_match = FORM_ID_RE.search(base_url)
         if not form_id_match:
-            path_parts = parsed_url.path.split('/')
-            form_id = None
-            if 'd' in path_parts and 'e' in path_parts:
-                try:
-                    d_index = path_parts.index('d')
-                    if d_index + 2 < len(path_parts):
-                        form_id = path_parts[d_index + 2]
-                except ValueError:
-                    pass 
-            if not form_id:
-                 print("Could not extract form ID from URL.")
-                 return None
-        else:
-            form_id = form_id_match.group(1)
+            logger.error("Could not extract form ID from URL.")
+            return None
+        form_id = form_id_match.group(1)
 
         base_form_url = f"https://docs.google.com/forms/d/e/{form_id}/viewform"
-        params = {'usp': 'pp_url'}
-        for question_id, answer in answers.items():
-            params[f'entry.{question_id}'] = str(answer) 
-        return f"{base_form_url}?{urlencode(params)}"
+        # entry.<id> keys never need escaping, so only the answers are quoted
+        parts = ['usp=pp_url']
+        parts.extend(f'entry.{question_id}={quote_plus(str(answer))}' for question_id, answer in answers.items())
+        return f"{base_form_url}?" + '&'.join(parts)
 
 def main():
+    logging.basicConfig(level=os.getenv('LOGLEVEL', 'INFO').upper(), format='%(message)s')
     if not GOOGLE_API_KEY:
         print("Google API Key not found. Please set your GOOGLE_API_KEY environment variable.")
         if input("Proceed without AI-assisted form filling? (y/n): ").lower() != 'y':
             return
 
     handler = GoogleFormHandler()
-    form_url = input("Enter the Google Form URL: ").strip()
-    if not form_url:
-        print("No form URL entered. Exiting.")
-        return
-
-    source_code = handler.get_form_source(form_url)
-    if not source_code:
-        return
-
-    form_data = handler.extract_form_data(source_code)
-    if not form_data:
-        print("Could not extract form data. Ensure the URL is a public Google Form and the structure is standard.")
-        return
-
-    questions = handler.extract_questions(form_data)
-    if not questions:
-        print("No questions were extracted. The form might be empty, or its structure might be incompatible.")
-        return
-
-    print("\nFound questions:")
-    for q_id, q_data in questions.items():
-        print(f"  ID: {q_id} - Question: {q_data['text']} (Type: {q_data['type']})")
-        if q_data['options']:
-            print(f"    Options: {json.dumps(q_data['options'])}")
-
-    answers = handler.generate_answers(questions)
+    try:
+        form_url = input("Enter the Google Form URL: ").strip()
+        if not form_url:
+            print("No form URL entered. Exiting.")
+            return
+
+        source_code = handler.get_form_source(form_url)
+        if not source_code:
+            return
+
+        form_data = handler.extract_form_data(source_code)
+        if not form_data:
+            print("Could not extract form data. Ensure the URL is a public Google Form and the structure is standard.")
+            return
+
+        questions = handler.extract_questions(form_data)
+        if not questions:
+            print("No questions were extracted. The form might be empty, or its structure might be incompatible.")
+            return
+
+        print("\nFound questions:")
+        for q_id, q_data in questions.items():
+            print(f"  ID: {q_id} - Question: {q_data['text']} (Type: {q_data['type']})")
+            if q_data['options']:
+                print(f"    Options: {_dumps(q_data['options'])}")
+
+        answers = handler.generate_answers(questions)
     
-    if not answers:
-        print("Failed to generate any answers.")
-        return
-
-    print("\nReview generated answers:")
-    all_answers_valid = True
-    for q_id, answer in answers.items():
-        question_text = questions.get(str(q_id), {}).get('text', f"Unknown Question ID: {q_id}")
-        print(f"  Q: {question_text}")
-        print(f"  A: {answer}")
-        if answer == "Error: No AI answer" or not answer.strip():
-            if questions.get(str(q_id), {}).get('type') != 1: 
-                 all_answers_valid = False
+        if not answers:
+            print("Failed to generate any answers.")
+            return
+
+        print("\nReview generated answers:")
+        all_answers_valid = True
+        for q_id, answer in answers.items():
+            q_data = questions.get(q_id, {})
+            question_text = q_data.get('text', f"Unknown Question ID: {q_id}")
+            print(f"  Q: {question_text}")
+            print(f"  A: {answer}")
+            if answer == "Error: No AI answer" or not answer.strip():
+                if q_data.get('type') != 1: 
+                     all_answers_valid = False
     
-    if not all_answers_valid:
-        print("\nWarning: Some answers could not be generated by AI or are empty for non-paragraph questions.")
+        if not all_answers_valid:
+            print("\nWarning: Some answers could not be generated by AI or are empty for non-paragraph questions.")
 
-    confirm = input("\nDo you want to proceed and open the pre-filled form? (y/n): ").lower()
-    if confirm != 'y':
-        print("Operation cancelled by user.")
-        return
+        confirm = input("\nDo you want to proceed and open the pre-filled form? (y/n): ").lower()
+        if confirm != 'y':
+            print("Operation cancelled by user.")
+            return
 
-    prefilled_url = handler.generate_prefilled_url(form_url, answers)
-    if prefilled_url:
-        print(f"\nPre-filled URL (for review):\n{prefilled_url}")
-        try:
-            import webbrowser
-            webbrowser.open(prefilled_url)
-            print("Attempted to open the pre-filled URL in your browser.")
-        except Exception as e:
-            print(f"Could not open browser: {e}. Please copy the URL manually.")
-    else:
-        print("Could not generate the pre-filled URL.")
+        prefilled_url = handler.generate_prefilled_url(form_url, answers)
+        if prefilled_url:
+            print(f"\nPre-filled URL (for review):\n{prefilled_url}")
+            try:
+                import webbrowser
+                webbrowser.open(prefilled_url)
+                print("Attempted to open the pre-filled URL in your browser.")
+            except Exception as e:
+                print(f"Could not open browser: {e}. Please copy the URL manually.")
+        else:
+            print("Could not generate the pre-filled URL.")
+    finally:
+        handler.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
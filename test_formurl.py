@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from Formurl import GoogleFormHandler, _clean_fb_payload
+
+
+def test_escapes_raw_newlines_inside_strings():
+    assert _clean_fb_payload('["a\nb","c\r\nd"]') == '["a\\nb","c\\r\\nd"]'
+
+
+def test_leaves_newlines_between_tokens():
+    assert _clean_fb_payload('[1,\n2]') == '[1,\n2]'
+
+
+def test_respects_escaped_quotes_and_backslashes():
+    payload = '["say \\"hi\\",]\n", "dir\\\\", "x\ny"]'
+    assert json.loads(_clean_fb_payload(payload)) == ['say "hi",]\n', 'dir\\', 'x\ny']
+
+
+def test_keeps_commas_inside_strings():
+    assert _clean_fb_payload('["a, ]", "b,}"]') == '["a, ]", "b,}"]'
+
+
+def test_drops_trailing_commas():
+    assert _clean_fb_payload('[1, [2,\n], {"k": 3, },]') == '[1, [2\n], {"k": 3 }]'
+
+
+def test_cleaned_payload_parses():
+    payload = '[null,["desc\nmore",[[1,"Q,]",null,2,[[10,[["A"],["B"],],],],],]]]'
+    assert json.loads(_clean_fb_payload(payload)) == [
+        None, ['desc\nmore', [[1, 'Q,]', None, 2, [[10, [['A'], ['B']]]]]]]
+    ]
+
+
+@pytest.mark.parametrize('url', [
+    'https://docs.google.com/forms/d/e/ABC/viewform',
+    'https://docs.google.com/forms/u/1/d/e/ABC/viewform',
+    'https://docs.google.com/forms/d/e/ABC/formResponse',
+    'https://docs.google.com/forms/d/e/ABC/viewform?usp=sf_link',
+])
+def test_prefilled_url_form_id_shapes(url):
+    assert GoogleFormHandler().generate_prefilled_url(url, {'123': 'a b'}) == (
+        'https://docs.google.com/forms/d/e/ABC/viewform?usp=pp_url&entry.123=a+b'
+    )
+
+
+def test_prefilled_url_rejects_editor_url():
+    assert GoogleFormHandler().generate_prefilled_url('https://docs.google.com/forms/d/XYZ/edit', {}) is None
+
+
+class _FailingCache(dict):
+    def __setitem__(self, key, value):
+        raise OSError("disk full")
+
+
+class _Response:
+    text = ' Blue \n'
+
+
+class _Model:
+    def generate_content(self, context):
+        return _Response()
+
+
+def test_cache_store_failure_keeps_answer():
+    handler = GoogleFormHandler()
+    handler.model = _Model()
+    handler._cache = _FailingCache()
+    assert handler._generate_text('prompt') == 'Blue'
+
+
+def test_close_is_safe_to_repeat():
+    handler = GoogleFormHandler()
+    handler._cache = _FailingCache()
+    handler.close()
+    handler.close()
+    assert handler._cache is None